@@ -3,49 +3,214 @@ Core Interview Agent for Excel Mock Interviewer
 Handles conversation flow, state management, and question progression
 """
 
+import re
 import json
-import uuid
+import queue
+import atexit
+import asyncio
+import logging
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 import os
-from groq import Groq
+import httpx
+from groq import AsyncGroq, RateLimitError
+from uuid_utils import uuid7
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+EVAL_CACHE_PATH = "data/eval_cache.sqlite"
+EVAL_CACHE_SIZE = 4096
+# Part of every LLM cache key; bump whenever a prompt or its response schema changes
+PROMPT_VERSION = 3
+INTERVIEW_DB_PATH = "data/interviews.db"
+SESSION_CACHE_SIZE = 1024
+RATE_LIMIT_RETRIES = 3
+MAX_ANSWER_CHARS = 2000
+SKILL_AREAS = ("technical_accuracy", "practical_application", "communication", "advanced_knowledge")
+
+
+def _json_dumps(obj) -> str:
+    """Serialize to JSON text, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _json_loads(data):
+    """Parse JSON text or bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Predefined questions organized by difficulty level, shared by all agents
+_QUESTION_BANK: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "basic": (
+        "What is the difference between a relative and absolute cell reference in Excel?",
+        "How would you use the SUM function to calculate the total of cells A1 through A10?",
+        "Explain the purpose of Excel's AutoSum feature and how to use it.",
+        "What is the shortcut to copy a cell in Excel?",
+        "How do you format a cell to display numbers as currency?"
+    ),
+    "intermediate": (
+        "Explain how VLOOKUP works and provide an example scenario where you'd use it.",
+        "What's the difference between VLOOKUP and INDEX-MATCH? When would you use each?",
+        "How would you create a pivot table to analyze sales data by region and product?",
+        "Describe how to use conditional formatting to highlight cells based on their values.",
+        "What is the COUNTIF function and how would you use it to count cells meeting specific criteria?"
+    ),
+    "advanced": (
+        "How would you create a nested IF statement with multiple conditions?",
+        "Explain array formulas in Excel and provide an example of when you'd use them.",
+        "How would you use Excel's Goal Seek feature for what-if analysis?",
+        "Describe how to create and use named ranges in formulas.",
+        "What are Excel macros and how would you create a simple macro to automate a task?"
+    )
+})
 
 class InterviewAgent:
     """Main interview agent that manages the entire interview process"""
     
+    _READY_RE = re.compile(r"\b(?:yes|ready|start|begin|go|sure|ok)\b", re.IGNORECASE)
+    
+    # Session keys owned by the background writer, never touched by a conversation turn
+    _WRITER_KEYS = frozenset(("_dirty", "_saved_messages", "_saved_evaluations"))
+    
+    # Scoring rubric sent as a fixed system message on every evaluation
+    _EVAL_RUBRIC = (
+        "You are an expert Excel interviewer. Score the candidate's answer 0-10, weighting "
+        "technical accuracy 40%, practical application 30%, communication 20%, advanced knowledge 10%. "
+    )
+    _EVAL_SCHEMA = (
+        '{"score":0-10,"points":0-15,"technical_accuracy":0-10,'
+        '"practical_application":0-10,"communication":0-10,"advanced_knowledge":0-10,'
+        '"feedback":str,"strengths":[str],"improvements":[str]}'
+    )
+    _EVAL_SYSTEM = _EVAL_RUBRIC + "Reply with JSON: " + _EVAL_SCHEMA
+    # Variant used when the same call also drafts the next question per difficulty level
+    _EVAL_WITH_NEXT_SYSTEM = (
+        _EVAL_RUBRIC + "Also draft the next Excel question at each difficulty level. "
+        'Reply with JSON: {"evaluation":' + _EVAL_SCHEMA + ','
+        '"next_questions":{"basic":str,"intermediate":str,"advanced":str}}'
+    )
+    
     def __init__(self, groq_api_key: str):
-        self.groq_client = Groq(api_key=groq_api_key)
-        self.question_bank = self._load_question_bank()
-        
-    def _load_question_bank(self) -> Dict:
-        """Load predefined questions organized by difficulty level"""
-        return {
-            "basic": [
-                "What is the difference between a relative and absolute cell reference in Excel?",
-                "How would you use the SUM function to calculate the total of cells A1 through A10?",
-                "Explain the purpose of Excel's AutoSum feature and how to use it.",
-                "What is the shortcut to copy a cell in Excel?",
-                "How do you format a cell to display numbers as currency?"
-            ],
-            "intermediate": [
-                "Explain how VLOOKUP works and provide an example scenario where you'd use it.",
-                "What's the difference between VLOOKUP and INDEX-MATCH? When would you use each?",
-                "How would you create a pivot table to analyze sales data by region and product?",
-                "Describe how to use conditional formatting to highlight cells based on their values.",
-                "What is the COUNTIF function and how would you use it to count cells meeting specific criteria?"
-            ],
-            "advanced": [
-                "How would you create a nested IF statement with multiple conditions?",
-                "Explain array formulas in Excel and provide an example of when you'd use them.",
-                "How would you use Excel's Goal Seek feature for what-if analysis?",
-                "Describe how to create and use named ranges in formulas.",
-                "What are Excel macros and how would you create a simple macro to automate a task?"
-            ]
-        }
+        # One pooled HTTP/2 client for all Groq calls, with bounded timeouts
+        self.groq_client = AsyncGroq(
+            api_key=groq_api_key,
+            max_retries=2,
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+                timeout=httpx.Timeout(30.0, connect=5.0)
+            )
+        )
+        self.question_bank = _QUESTION_BANK
+        self._eval_cache: "OrderedDict[str, object]" = OrderedDict()
+        self._eval_cache_lock = threading.Lock()
+        self._eval_cache_db = self._open_eval_cache()
+        self._db = self._open_interview_db()
+        self._db_lock = threading.Lock()
+        self._sessions: "OrderedDict[str, Dict]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        self._write_queue: "queue.Queue[Dict]" = queue.Queue()
+        threading.Thread(target=self._writer_loop, name="interview-writer", daemon=True).start()
+        atexit.register(self._flush_all_sessions)
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="interview-agent-loop", daemon=True).start()
+        
+    def run_sync(self, coro):
+        """Run an agent coroutine on the agent's event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def _open_eval_cache(self) -> sqlite3.Connection:
+        """Open the persistent store backing the LLM response cache"""
+        os.makedirs(os.path.dirname(EVAL_CACHE_PATH), exist_ok=True)
+        db = sqlite3.connect(EVAL_CACHE_PATH, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        db.commit()
+        return db
+    
+    def _open_interview_db(self) -> sqlite3.Connection:
+        """Open the interview store, creating its tables on first use"""
+        os.makedirs(os.path.dirname(INTERVIEW_DB_PATH), exist_ok=True)
+        db = sqlite3.connect(INTERVIEW_DB_PATH, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript("""
+            CREATE TABLE IF NOT EXISTS interviews (id TEXT PRIMARY KEY, meta TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS messages (
+                interview_id TEXT NOT NULL, role TEXT NOT NULL, content TEXT NOT NULL, ts TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_messages_interview ON messages (interview_id);
+            CREATE TABLE IF NOT EXISTS evaluations (
+                interview_id TEXT NOT NULL, idx INTEGER NOT NULL, json TEXT NOT NULL,
+                PRIMARY KEY (interview_id, idx)
+            );
+        """)
+        db.commit()
+        return db
+    
+    async def _create_completion(self, **kwargs):
+        """Create a chat completion, backing off exponentially while Groq rate-limits us"""
+        for attempt in range(RATE_LIMIT_RETRIES):
+            try:
+                return await self.groq_client.chat.completions.create(**kwargs)
+            except RateLimitError:
+                await asyncio.sleep(2 ** attempt)
+        return await self.groq_client.chat.completions.create(**kwargs)
+    
+    def _cache_key(self, *parts) -> str:
+        """Build a stable cache key from the inputs that determine an LLM response"""
+        parts = (PROMPT_VERSION,) + parts
+        return hashlib.blake2b("|".join(str(part) for part in parts).encode()).hexdigest()
+    
+    def _remember_cached(self, key: str, value):
+        """Keep a cached LLM result in the bounded in-memory LRU"""
+        self._eval_cache[key] = value
+        self._eval_cache.move_to_end(key)
+        while len(self._eval_cache) > EVAL_CACHE_SIZE:
+            self._eval_cache.popitem(last=False)
+    
+    def _cache_get(self, key: str):
+        """Look up a cached LLM result, falling back to the on-disk store"""
+        with self._eval_cache_lock:
+            if key in self._eval_cache:
+                self._eval_cache.move_to_end(key)
+                return self._eval_cache[key]
+            row = self._eval_cache_db.execute("SELECT value FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value = _json_loads(row[0])
+            self._remember_cached(key, value)
+            return value
     
+    def _cache_set(self, key: str, value):
+        """Store an LLM result in memory and on disk"""
+        with self._eval_cache_lock:
+            self._remember_cached(key, value)
+            self._eval_cache_db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value) VALUES (?, ?)",
+                (key, _json_dumps(value))
+            )
+            self._eval_cache_db.commit()
+        
     def start_interview(self, candidate_name: str, target_role: str, experience_level: str) -> Dict:
         """Initialize a new interview session"""
-        interview_id = str(uuid.uuid4())
+        # Time-ordered IDs keep interview inserts at the right edge of the primary key index
+        interview_id = str(uuid7())
         
         interview_data = {
             "id": interview_id,
@@ -95,25 +260,33 @@ Welcome to the AI-Powered Excel Mock Interviewer. I'm here to assess your Excel
 
 Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
 
-    def process_message(self, interview_id: str, user_message: str) -> Dict:
+    async def process_message(self, interview_id: str, user_message: str) -> Dict:
         """Process user message and generate appropriate response"""
-        interview_data = self._load_interview_data(interview_id)
+        # Storage calls run in worker threads so they never stall other interviews on the loop
+        interview_data = await asyncio.to_thread(self._load_interview_data, interview_id)
         
         if not interview_data:
             return {"error": "Interview not found"}
         
+        # Run the turn against a working copy so a failure part-way through leaves the session untouched
+        session_data = interview_data
+        interview_data = self._turn_copy(session_data)
+        
+        # One timestamp for the whole turn
+        now_iso = datetime.now(timezone.utc).isoformat()
+        
         # Add user message to conversation
         interview_data["messages"].append({
             "role": "candidate",
             "content": user_message,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now_iso
         })
         
         # Process based on current phase
         if interview_data["current_phase"] == "introduction":
-            response = self._handle_introduction(interview_data, user_message)
+            response = await self._handle_introduction(interview_data, user_message)
         elif interview_data["current_phase"] == "assessment":
-            response = self._handle_assessment(interview_data, user_message)
+            response = await self._handle_assessment(interview_data, user_message)
         else:
             response = self._handle_conclusion(interview_data)
         
@@ -121,20 +294,37 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
         interview_data["messages"].append({
             "role": "interviewer",
             "content": response["message"],
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": now_iso
         })
         
         # Update interview data
         interview_data.update(response.get("interview_updates", {}))
-        self._save_interview_data(interview_data)
+        self._commit_turn(session_data, interview_data)
+        await asyncio.to_thread(self._save_interview_data, session_data)
         
         return response
     
-    def _handle_introduction(self, interview_data: Dict, user_message: str) -> Dict:
+    def _turn_copy(self, interview_data: Dict) -> Dict:
+        """Copy the parts of a session a conversation turn may change"""
+        turn_data = {k: v for k, v in interview_data.items() if k not in self._WRITER_KEYS}
+        turn_data["messages"] = list(interview_data["messages"])
+        turn_data["evaluations"] = list(interview_data["evaluations"])
+        if "_recent_scores" in turn_data:
+            turn_data["_recent_scores"] = deque(turn_data["_recent_scores"], maxlen=3)
+            turn_data["_skill_sums"] = dict(turn_data["_skill_sums"])
+        return turn_data
+    
+    def _commit_turn(self, interview_data: Dict, turn_data: Dict):
+        """Apply a successful turn's working copy back onto the cached session"""
+        for key in [k for k in interview_data if k not in turn_data and k not in self._WRITER_KEYS]:
+            del interview_data[key]
+        interview_data.update(turn_data)
+    
+    async def _handle_introduction(self, interview_data: Dict, user_message: str) -> Dict:
         """Handle introduction phase responses"""
-        if any(word in user_message.lower() for word in ["yes", "ready", "start", "begin"]):
+        if self._READY_RE.search(user_message):
             # Move to assessment phase
-            question = self._get_next_question(interview_data)
+            question = await self._get_next_question(interview_data)
             
             return {
                 "message": f"Perfect! Let's start with our first question:\n\n**Question 1:** {question}",
@@ -148,18 +338,20 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
                 "message": "No worries! Take your time. When you're ready to begin the Excel assessment, just let me know by typing 'ready' or 'yes'."
             }
     
-    def _handle_assessment(self, interview_data: Dict, user_message: str) -> Dict:
+    async def _handle_assessment(self, interview_data: Dict, user_message: str) -> Dict:
         """Handle assessment phase - evaluate answer and ask next question"""
-        # Evaluate the current answer
-        evaluation = self._evaluate_answer(interview_data, user_message)
-        interview_data["evaluations"].append(evaluation)
+        # Evaluate the current answer; once the question bank runs out, draft the next question in the same LLM call
+        question_count = interview_data["question_count"]
+        needs_adaptive = question_count < 8 and any(
+            question_count >= len(questions) for questions in self.question_bank.values()
+        )
+        evaluation = await self._evaluate_answer(interview_data, user_message, needs_adaptive)
+        self._record_evaluation(interview_data, evaluation)
         
         # Update score
         interview_data["score"] += evaluation["points"]
         
         # Determine if we should continue or conclude
-        question_count = interview_data["question_count"]
-        
         if question_count >= 8 or self._should_conclude_interview(interview_data):
             # Move to conclusion
             return {
@@ -172,7 +364,7 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
             }
         else:
             # Ask next question
-            next_question = self._get_next_question(interview_data)
+            next_question = await self._get_next_question(interview_data)
             feedback = self._generate_brief_feedback(evaluation)
             
             return {
@@ -182,53 +374,59 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
                 }
             }
     
-    def _evaluate_answer(self, interview_data: Dict, answer: str) -> Dict:
-        """Use AI to evaluate the candidate's answer"""
+    async def _evaluate_answer(self, interview_data: Dict, answer: str,
+                               with_next_questions: bool = False) -> Dict:
+        """Use AI to evaluate the candidate's answer
+        
+        With with_next_questions, the same call also drafts a follow-up question per difficulty
+        level, stashed on interview_data for _get_next_question.
+        """
         current_question = self._get_current_question(interview_data)
         difficulty = interview_data["current_difficulty"]
         
-        evaluation_prompt = f"""
-        You are an expert Excel interviewer evaluating a candidate's response. 
-        
-        Question: {current_question}
-        Difficulty Level: {difficulty}
-        Candidate's Answer: {answer}
-        
-        Evaluate this answer on a scale of 0-10 based on:
-        1. Technical Accuracy (40%)
-        2. Practical Application (30%) 
-        3. Communication Clarity (20%)
-        4. Advanced Knowledge (10%)
-        
-        Respond with JSON format:
-        {{
-            "score": <0-10>,
-            "points": <0-15>,
-            "technical_accuracy": <0-10>,
-            "practical_application": <0-10>,
-            "communication": <0-10>,
-            "advanced_knowledge": <0-10>,
-            "feedback": "<detailed feedback>",
-            "strengths": ["<strength1>", "<strength2>"],
-            "improvements": ["<improvement1>", "<improvement2>"]
-        }}
-        """
+        cache_key = self._cache_key(
+            "evaluate", current_question, difficulty, answer.strip().lower(),
+            "llama-3.1-70b-versatile", 0.3
+        )
+        cached = await asyncio.to_thread(self._cache_get, cache_key)
+        if cached is not None:
+            try:
+                self._validate_evaluation(cached)
+                return {**cached, "question": current_question, "answer": answer}
+            except ValueError:
+                logger.warning("Ignoring invalid cached evaluation %s", cache_key)
+        
+        evaluation_prompt = f"Q:{current_question}\nA:{answer[:MAX_ANSWER_CHARS]}\nLevel:{difficulty}"
+        
+        if with_next_questions:
+            previous_questions = [eval["question"] for eval in interview_data["evaluations"]] + [current_question]
+            evaluation_prompt += (
+                f"\nNext questions for a {interview_data['target_role']}: "
+                f"practical, specific, answerable in 2-3 sentences, not repeating {previous_questions}"
+            )
         
         try:
-            response = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": evaluation_prompt}],
+            response = await self._create_completion(
+                messages=[
+                    {"role": "system", "content": self._EVAL_WITH_NEXT_SYSTEM if with_next_questions else self._EVAL_SYSTEM},
+                    {"role": "user", "content": evaluation_prompt}
+                ],
                 model="llama-3.1-70b-versatile",
                 temperature=0.3,
-                max_tokens=1000
+                max_tokens=900 if with_next_questions else 600,
+                response_format={"type": "json_object"}
             )
             
-            evaluation_text = response.choices[0].message.content
-            # Extract JSON from response
-            json_start = evaluation_text.find('{')
-            json_end = evaluation_text.rfind('}') + 1
-            evaluation_json = evaluation_text[json_start:json_end]
+            evaluation = _json_loads(response.choices[0].message.content)
+            if with_next_questions:
+                interview_data["_next_questions"] = self._valid_next_questions(evaluation.get("next_questions"))
+                # Tolerate the model replying with the flat evaluation object
+                evaluation = evaluation.get("evaluation", evaluation)
+            # Reject malformed replies before they are scored or cached
+            self._validate_evaluation(evaluation)
+            await asyncio.to_thread(self._cache_set, cache_key, evaluation)
             
-            evaluation = json.loads(evaluation_json)
+            evaluation = dict(evaluation)
             evaluation["question"] = current_question
             evaluation["answer"] = answer
             
@@ -236,6 +434,7 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
             
         except Exception as e:
             # Fallback evaluation if AI fails
+            logger.exception("Answer evaluation failed, using fallback score")
             return {
                 "score": 5,
                 "points": 7,
@@ -251,39 +450,56 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
                 "error": str(e)
             }
     
+    def _validate_evaluation(self, evaluation):
+        """Raise ValueError unless the evaluation has every field the interview flow relies on"""
+        if not isinstance(evaluation, dict):
+            raise ValueError(f"evaluation must be an object, got {type(evaluation).__name__}")
+        for field in ("score", "points") + SKILL_AREAS:
+            value = evaluation.get(field)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"evaluation field {field!r} must be a number, got {value!r}")
+        if not isinstance(evaluation.get("feedback"), str):
+            raise ValueError("evaluation field 'feedback' must be a string")
+    
+    def _valid_next_questions(self, next_questions) -> Dict[str, str]:
+        """Keep drafted next questions only if they are a mapping of non-empty strings"""
+        if not isinstance(next_questions, dict):
+            return {}
+        if not all(isinstance(question, str) and question.strip() for question in next_questions.values()):
+            return {}
+        return next_questions
+    
     def _get_current_question(self, interview_data: Dict) -> str:
         """Get the current question being asked"""
-        messages = interview_data["messages"]
-        for message in reversed(messages):
-            if message["role"] == "interviewer" and "Question" in message["content"]:
-                # Extract question from message
-                content = message["content"]
-                if "**Question" in content:
-                    question_part = content.split("**Question")[1]
-                    if "**" in question_part:
-                        return question_part.split("**")[0].split(":", 1)[1].strip()
-        return "Previous question not found"
-    
-    def _get_next_question(self, interview_data: Dict) -> str:
+        return interview_data.get("current_question", "Previous question not found")
+    
+    async def _get_next_question(self, interview_data: Dict) -> str:
         """Get the next question based on performance"""
         difficulty = self._determine_next_difficulty(interview_data)
         interview_data["current_difficulty"] = difficulty
         
         questions = self.question_bank[difficulty]
         question_count = interview_data["question_count"]
+        drafted_questions = interview_data.pop("_next_questions", {})
         
         # Cycle through questions or use AI to generate new ones
         if question_count < len(questions):
-            return questions[question_count % len(questions)]
+            question = questions[question_count % len(questions)]
         else:
-            return self._generate_adaptive_question(interview_data, difficulty)
+            # Prefer the question drafted alongside the last evaluation
+            question = drafted_questions.get(difficulty)
+            if not question:
+                question = await self._generate_adaptive_question(interview_data, difficulty)
+        
+        interview_data["current_question"] = question
+        return question
     
     def _determine_next_difficulty(self, interview_data: Dict) -> str:
         """Determine the next question difficulty based on performance"""
         if not interview_data["evaluations"]:
             return "basic"
         
-        recent_scores = [eval["score"] for eval in interview_data["evaluations"][-3:]]
+        recent_scores, _ = self._running_stats(interview_data)
         avg_score = sum(recent_scores) / len(recent_scores)
         
         if avg_score >= 8:
@@ -293,10 +509,18 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
         else:
             return "basic"
     
-    def _generate_adaptive_question(self, interview_data: Dict, difficulty: str) -> str:
+    async def _generate_adaptive_question(self, interview_data: Dict, difficulty: str) -> str:
         """Generate a new question using AI based on previous performance"""
         previous_questions = [eval["question"] for eval in interview_data["evaluations"]]
         
+        cache_key = self._cache_key(
+            "adaptive_question", difficulty, tuple(previous_questions), interview_data["target_role"],
+            "llama-3.1-70b-versatile", 0.7
+        )
+        cached = await asyncio.to_thread(self._cache_get, cache_key)
+        if cached is not None:
+            return cached
+        
         prompt = f"""
         Generate a {difficulty}-level Excel interview question. 
         
@@ -313,13 +537,15 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
         """
         
         try:
-            response = self.groq_client.chat.completions.create(
+            response = await self._create_completion(
                 messages=[{"role": "user", "content": prompt}],
                 model="llama-3.1-70b-versatile",
                 temperature=0.7,
                 max_tokens=200
             )
-            return response.choices[0].message.content.strip()
+            question = response.choices[0].message.content.strip()
+            await asyncio.to_thread(self._cache_set, cache_key, question)
+            return question
         except:
             # Fallback to predefined questions
             return self.question_bank[difficulty][0]
@@ -339,9 +565,8 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
     def _should_conclude_interview(self, interview_data: Dict) -> bool:
         """Determine if the interview should be concluded"""
         # Conclude after 8 questions or if performance is consistently very low/high
-        evaluations = interview_data["evaluations"]
-        if len(evaluations) >= 5:
-            recent_scores = [eval["score"] for eval in evaluations[-3:]]
+        if len(interview_data["evaluations"]) >= 5:
+            recent_scores, _ = self._running_stats(interview_data)
             avg_score = sum(recent_scores) / len(recent_scores)
             
             # If consistently scoring very high or very low, can conclude early
@@ -350,16 +575,17 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
         
         return False
     
-    def generate_final_report(self, interview_id: str) -> Dict:
+    async def generate_final_report(self, interview_id: str) -> Dict:
         """Generate comprehensive final performance report"""
-        interview_data = self._load_interview_data(interview_id)
+        interview_data = await asyncio.to_thread(self._load_interview_data, interview_id)
         
         if not interview_data or not interview_data["evaluations"]:
             return {"error": "No evaluation data found"}
         
         # Calculate overall metrics
         evaluations = interview_data["evaluations"]
-        total_score = sum(eval["score"] for eval in evaluations)
+        _, skill_sums = self._running_stats(interview_data)
+        total_score = skill_sums["score"]
         avg_score = total_score / len(evaluations)
         total_points = interview_data["score"]
         max_possible_points = len(evaluations) * 10
@@ -377,7 +603,7 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
         Percentage: {percentage_score:.1f}%
         
         Detailed Evaluations:
-        {json.dumps([{"question": e["question"], "answer": e["answer"], "score": e["score"], "feedback": e["feedback"]} for e in evaluations], indent=2)}
+        {_json_dumps([{"question": e["question"], "score": e["score"], "feedback": e["feedback"][:300]} for e in evaluations])}
         
         Create a professional report with:
         1. Overall Performance Summary
@@ -390,7 +616,7 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
         """
         
         try:
-            response = self.groq_client.chat.completions.create(
+            response = await self._create_completion(
                 messages=[{"role": "user", "content": report_prompt}],
                 model="llama-3.1-70b-versatile",
                 temperature=0.3,
@@ -413,24 +639,45 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
             "questions_answered": len(evaluations),
             "interview_duration": self._calculate_duration(interview_data),
             "detailed_report": detailed_report,
-            "skill_breakdown": self._calculate_skill_breakdown(evaluations),
+            "skill_breakdown": self._calculate_skill_breakdown(interview_data),
             "evaluations": evaluations
         }
     
-    def _calculate_skill_breakdown(self, evaluations: List[Dict]) -> Dict:
+    def _calculate_skill_breakdown(self, interview_data: Dict) -> Dict:
         """Calculate breakdown of different skill areas"""
+        evaluations = interview_data["evaluations"]
         if not evaluations:
             return {}
         
-        skill_totals = {
-            "technical_accuracy": sum(e.get("technical_accuracy", 0) for e in evaluations) / len(evaluations),
-            "practical_application": sum(e.get("practical_application", 0) for e in evaluations) / len(evaluations),
-            "communication": sum(e.get("communication", 0) for e in evaluations) / len(evaluations),
-            "advanced_knowledge": sum(e.get("advanced_knowledge", 0) for e in evaluations) / len(evaluations)
-        }
+        _, skill_sums = self._running_stats(interview_data)
+        skill_totals = {skill: skill_sums[skill] / len(evaluations) for skill in SKILL_AREAS}
         
         return skill_totals
     
+    def _record_evaluation(self, interview_data: Dict, evaluation: Dict):
+        """Append an evaluation and fold it into the running score statistics"""
+        recent_scores, skill_sums = self._running_stats(interview_data)
+        interview_data["evaluations"].append(evaluation)
+        self._accumulate_evaluation(recent_scores, skill_sums, evaluation)
+    
+    def _running_stats(self, interview_data: Dict) -> Tuple[deque, Dict[str, float]]:
+        """Get the last-3 score window and running score sums, rebuilding them after a cold load"""
+        if "_recent_scores" not in interview_data:
+            recent_scores: deque = deque(maxlen=3)
+            skill_sums = dict.fromkeys(("score",) + SKILL_AREAS, 0)
+            for evaluation in interview_data["evaluations"]:
+                self._accumulate_evaluation(recent_scores, skill_sums, evaluation)
+            interview_data["_recent_scores"] = recent_scores
+            interview_data["_skill_sums"] = skill_sums
+        return interview_data["_recent_scores"], interview_data["_skill_sums"]
+    
+    def _accumulate_evaluation(self, recent_scores: deque, skill_sums: Dict[str, float], evaluation: Dict):
+        """Add a single evaluation to the running score statistics"""
+        recent_scores.append(evaluation["score"])
+        skill_sums["score"] += evaluation["score"]
+        for skill in SKILL_AREAS:
+            skill_sums[skill] += evaluation.get(skill, 0)
+    
     def _calculate_duration(self, interview_data: Dict) -> str:
         """Calculate interview duration"""
         try:
@@ -445,18 +692,133 @@ Are you ready to begin? Just type "yes" or "ready" when you're set to start!"""
         except:
             return "Unknown"
     
+    def _remember_session(self, interview_data: Dict):
+        """Keep an interview in the in-memory LRU, flushing whatever it evicts"""
+        evicted = []
+        with self._sessions_lock:
+            self._sessions[interview_data["id"]] = interview_data
+            self._sessions.move_to_end(interview_data["id"])
+            while len(self._sessions) > SESSION_CACHE_SIZE:
+                evicted.append(self._sessions.popitem(last=False)[1])
+        
+        # Write evicted sessions outside the lock so cache lookups never wait on SQLite
+        for session in evicted:
+            try:
+                self._flush_interview_data(session)
+            except Exception:
+                logger.exception("Failed to persist evicted interview %s", session.get("id"))
+    
     def _save_interview_data(self, interview_data: Dict):
-        """Save interview data to file"""
-        os.makedirs("data", exist_ok=True)
-        filepath = f"data/interview_{interview_data['id']}.json"
-        with open(filepath, 'w') as f:
-            json.dump(interview_data, f, indent=2)
+        """Mark interview data dirty and hand it to the background writer"""
+        interview_data["_dirty"] = True
+        if interview_data["status"] == "completed":
+            # Finished interviews are written through and leave the hot cache
+            self._flush_interview_data(interview_data)
+            with self._sessions_lock:
+                self._sessions.pop(interview_data["id"], None)
+            return
+        
+        self._remember_session(interview_data)
+        self._write_queue.put(interview_data)
+    
+    def _writer_loop(self):
+        """Persist queued interviews in the background"""
+        while True:
+            interview_data = self._write_queue.get()
+            try:
+                self._flush_interview_data(interview_data)
+            except Exception:
+                logger.exception("Failed to persist interview %s", interview_data.get("id"))
+    
+    def _flush_all_sessions(self):
+        """Synchronously persist every cached interview with unsaved changes"""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+        for interview_data in sessions:
+            self._flush_interview_data(interview_data)
+    
+    def _flush_interview_data(self, interview_data: Dict):
+        """Write interview metadata and append any new messages/evaluations"""
+        with self._db_lock:
+            if not interview_data.get("_dirty"):
+                return
+            interview_data["_dirty"] = False
+            
+            try:
+                snapshot = dict(interview_data)
+                meta = {k: v for k, v in snapshot.items()
+                        if k not in ("messages", "evaluations") and not k.startswith("_")}
+                saved_messages = snapshot.get("_saved_messages", 0)
+                saved_evaluations = snapshot.get("_saved_evaluations", 0)
+                new_messages = snapshot["messages"][saved_messages:]
+                new_evaluations = snapshot["evaluations"][saved_evaluations:]
+                
+                self._db.execute(
+                    "INSERT OR REPLACE INTO interviews (id, meta) VALUES (?, ?)",
+                    (snapshot["id"], _json_dumps(meta))
+                )
+                self._db.executemany(
+                    "INSERT INTO messages (interview_id, role, content, ts) VALUES (?, ?, ?, ?)",
+                    [(snapshot["id"], m["role"], m["content"], m.get("timestamp")) for m in new_messages]
+                )
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO evaluations (interview_id, idx, json) VALUES (?, ?, ?)",
+                    [(snapshot["id"], saved_evaluations + i, _json_dumps(e)) for i, e in enumerate(new_evaluations)]
+                )
+                self._db.commit()
+                interview_data["_saved_messages"] = saved_messages + len(new_messages)
+                interview_data["_saved_evaluations"] = saved_evaluations + len(new_evaluations)
+            except Exception:
+                # Drop the partial write and leave the interview dirty so the next save retries it
+                self._db.rollback()
+                interview_data["_dirty"] = True
+                raise
     
     def _load_interview_data(self, interview_id: str) -> Optional[Dict]:
-        """Load interview data from file"""
+        """Load interview data from the session cache or the database"""
+        with self._sessions_lock:
+            if interview_id in self._sessions:
+                self._sessions.move_to_end(interview_id)
+                return self._sessions[interview_id]
+        
+        with self._db_lock:
+            row = self._db.execute("SELECT meta FROM interviews WHERE id = ?", (interview_id,)).fetchone()
+            if row is None:
+                interview_data = None
+            else:
+                interview_data = _json_loads(row[0])
+                interview_data["messages"] = [
+                    {"role": role, "content": content, "timestamp": ts}
+                    for role, content, ts in self._db.execute(
+                        "SELECT role, content, ts FROM messages WHERE interview_id = ? ORDER BY rowid", (interview_id,)
+                    )
+                ]
+                interview_data["evaluations"] = [
+                    _json_loads(evaluation)
+                    for (evaluation,) in self._db.execute(
+                        "SELECT json FROM evaluations WHERE interview_id = ? ORDER BY idx", (interview_id,)
+                    )
+                ]
+                interview_data["_saved_messages"] = len(interview_data["messages"])
+                interview_data["_saved_evaluations"] = len(interview_data["evaluations"])
+        
+        if interview_data is None:
+            return self._load_legacy_interview_data(interview_id)
+        
+        if interview_data["status"] == "completed":
+            return interview_data
+        with self._sessions_lock:
+            # Another request may have loaded the same interview meanwhile
+            interview_data = self._sessions.setdefault(interview_id, interview_data)
+            self._sessions.move_to_end(interview_id)
+        return interview_data
+    
+    def _load_legacy_interview_data(self, interview_id: str) -> Optional[Dict]:
+        """Load an interview saved as a per-interview JSON file by older versions"""
         filepath = f"data/interview_{interview_id}.json"
         try:
-            with open(filepath, 'r') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f:
+                interview_data = _json_loads(f.read())
         except FileNotFoundError:
-            return None
\ No newline at end of file
+            return None
+        return interview_data
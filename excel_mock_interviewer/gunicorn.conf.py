@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration for Excel Mock Interviewer
+Run with: gunicorn -c gunicorn.conf.py main:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# Keep a single worker so every request shares one InterviewAgent (its
+# in-memory sessions and LLM event loop); threads only wait on Groq calls
+# running concurrently on that loop, so many interviews fit in one process
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', 100))
+timeout = 120
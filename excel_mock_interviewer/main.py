@@ -76,7 +76,7 @@ def send_message():
         if not interview_id:
             return jsonify({'error': 'No active interview session'}), 400
         
-        result = interview_agent.process_message(interview_id, message)
+        result = interview_agent.run_sync(interview_agent.process_message(interview_id, message))
         
         if 'error' in result:
             return jsonify(result), 404
@@ -121,7 +121,7 @@ def get_interview_status(interview_id):
 def get_final_report(interview_id):
     """Generate and return the final interview report"""
     try:
-        report = interview_agent.generate_final_report(interview_id)
+        report = interview_agent.run_sync(interview_agent.generate_final_report(interview_id))
         
         if 'error' in report:
             return jsonify(report), 404
@@ -153,9 +153,10 @@ if __name__ == '__main__':
     # Create data directory if it doesn't exist
     os.makedirs('data', exist_ok=True)
     
-    # Run the application
+    # Run the development server (use gunicorn.conf.py in production)
     app.run(
         host='0.0.0.0',
         port=int(os.getenv('PORT', 5000)),
-        debug=os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+        debug=os.getenv('FLASK_DEBUG', 'True').lower() == 'true',
+        threaded=True
     )